@@ -1,12 +1,33 @@
 import subprocess
+from collections import deque
+from urllib.parse import quote
 import click
-import base64
+import requests
 from github import Github
 from github.GithubException import GithubException
 import fnmatch
 
 from .utils import generate_readme_content, require_api_keys
 
+# Extensiones de archivos cuyo contenido se descarga
+TEXT_FILE_EXTENSIONS = ('.py', '.md', '.txt', '.yml', '.yaml', '.json', '.js', '.css', '.html')
+
+# Tamaño máximo de un archivo individual que se descarga (en bytes)
+MAX_FILE_SIZE = 1024 * 1024
+
+# Tamaño máximo predeterminado de la información enviada al modelo (en KB).
+# llama-3.1-70b-versatile admite unos 128k tokens, aproximadamente 4 bytes por token.
+DEFAULT_MAX_PROMPT_SIZE = 256
+
+# Fracción del presupuesto reservada para la lista de rutas del proyecto
+PATH_LISTING_RESERVE = 0.2
+
+# Tiempo máximo de espera de cada descarga (en segundos)
+DOWNLOAD_TIMEOUT = 30
+
+# Tamaño de los bloques leídos al descargar un archivo (en bytes)
+DOWNLOAD_CHUNK_SIZE = 8192
+
 # Patrones de inclusión predeterminados
 DEFAULT_INCLUDE_PATTERNS = [
     # Python
@@ -230,17 +251,133 @@ def should_include_file(file_path, include_patterns, exclude_patterns):
     
     return False
 
+def iter_repository_files(repository):
+    """
+    Walk the repository tree breadth-first and yield its files one at a time.
+    Only the paths of pending directories are kept in memory, not the file objects.
+    """
+    pending_dirs = deque([""])
+    while pending_dirs:
+        for item in repository.get_contents(pending_dirs.popleft()):
+            if item.type == "dir":
+                pending_dirs.append(item.path)
+            else:
+                yield item
+
+def filter_files(files, include_patterns, exclude_patterns):
+    """
+    Yield only the files that match the inclusion and exclusion patterns.
+    """
+    for file_content in files:
+        if should_include_file(file_content.path, include_patterns, exclude_patterns):
+            yield file_content
+
+def fetch_file_text(repository, file_content, github_token, max_size):
+    """
+    Download and decode a text file, streaming it in chunks.
+    Returns None for files larger than max_size, or that look binary from their first chunk,
+    without downloading the rest. Raises UnicodeDecodeError if the file is not valid UTF-8.
+    """
+    if file_content.size > max_size:
+        return None
+
+    url = f"https://api.github.com/repos/{repository.full_name}/contents/{quote(file_content.path)}"
+    headers = {
+        "Authorization": f"token {github_token}",
+        "Accept": "application/vnd.github.v3.raw"
+    }
+    with requests.get(url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+        response.raise_for_status()
+        data = bytearray()
+        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+            if not data and b'\0' in chunk:
+                return None
+            data.extend(chunk)
+            if len(data) > max_size:
+                return None
+
+    return data.decode('utf-8')
+
+def format_file_content(repository, file_content, github_token, max_size):
+    """
+    Build the indented content block for a file, or a warning line if its content is skipped.
+    Content that would not fit in max_size bytes is skipped without being downloaded.
+    """
+    if file_content.size > max_size:
+        return "  Warning: Prompt size limit reached. Skipping content.\n"
+    try:
+        file_content_data = fetch_file_text(repository, file_content, github_token, MAX_FILE_SIZE)
+    except UnicodeDecodeError:
+        return "  Warning: Could not decode file content. Skipping content.\n"
+    except requests.exceptions.RequestException:
+        return "  Warning: Could not download file content. Skipping content.\n"
+    if file_content_data is None:
+        return "  Warning: File is too large or binary. Skipping content.\n"
+
+    text = "  Content:\n"
+    text += "  " + "\n  ".join(file_content_data.split("\n")) + "\n"
+    if len(text.encode('utf-8')) > max_size:
+        return "  Warning: Prompt size limit reached. Skipping content.\n"
+    return text
+
+def collect_repo_info(repository, files, github_token, max_bytes):
+    """
+    Build the repository information sent to the model, keeping it under max_bytes.
+    File contents only use the part of the budget not reserved for the path listing;
+    once that part is spent, the remaining files are listed without their contents.
+    The walk stops when no more paths fit, to avoid spending API calls on nothing.
+    """
+    repo_info = [
+        f"Repository: {repository.name}\n",
+        f"Description: {repository.description}\n\n",
+        "Project Structure:\n",
+    ]
+    used_bytes = sum(len(part.encode('utf-8')) for part in repo_info)
+    content_budget = max_bytes - int(max_bytes * PATH_LISTING_RESERVE)
+    listed_paths = 0
+    skipped_contents = 0
+
+    for file_content in files:
+        path_line = f"\n- {file_content.path}\n"
+        path_bytes = len(path_line.encode('utf-8'))
+        if used_bytes + path_bytes > max_bytes:
+            click.echo(f"Warning: Prompt size limit reached. Repository listing was truncated after {listed_paths} paths.")
+            break
+        click.echo(f"- {file_content.path}")
+        repo_info.append(path_line)
+        used_bytes += path_bytes
+        listed_paths += 1
+
+        if not file_content.path.lower().endswith(TEXT_FILE_EXTENSIONS):
+            continue
+        if used_bytes >= content_budget:
+            skipped_contents += 1
+            continue
+        text = format_file_content(repository, file_content, github_token, content_budget - used_bytes)
+        text_bytes = len(text.encode('utf-8'))
+        if used_bytes + text_bytes <= max_bytes:
+            repo_info.append(text)
+            used_bytes += text_bytes
+
+    if skipped_contents:
+        click.echo(f"Warning: Prompt size limit reached. Contents of {skipped_contents} files were left out of the repository information.")
+
+    return "".join(repo_info)
+
 @click.command()
 @click.pass_context
 @click.option('--repo', help='GitHub repository in the format "owner/repo". If not provided, uses the current repository.')
 @click.option('--output', default='README.md', help='Output file name')
 @click.option('--include', multiple=True, help='Additional file patterns to include')
 @click.option('--exclude', multiple=True, help='Additional file patterns to exclude')
+@click.option('--max-prompt-size', default=DEFAULT_MAX_PROMPT_SIZE, type=click.IntRange(min=1), help='Maximum size in KB of the repository information sent to the model')
 @require_api_keys('groq', 'github')
-def create_readme(ctx, repo, output, include, exclude):
+def create_readme(ctx, repo, output, include, exclude, max_prompt_size):
     """
     Creates a README file for the specified GitHub repository or the current repository if not specified.
     This function now generates a readable string representation of the repository structure and file contents.
+    Files are streamed one at a time and the collected text is capped at --max-prompt-size.
+    Listing memory still grows with the size of the largest directory and the number of pending directories.
     """
     # Combine default and user-specified patterns
     include_patterns = list(DEFAULT_INCLUDE_PATTERNS) + list(include)
@@ -264,36 +401,11 @@ def create_readme(ctx, repo, output, include, exclude):
         # Get the repository
         repository = github_client.get_repo(repo)
 
-        # Initialize the string to store repository information
-        repo_info = f"Repository: {repository.name}\n"
-        repo_info += f"Description: {repository.description}\n\n"
-        repo_info += "Project Structure:\n"
-
-        # Initialize a string to store only the project structure
-        project_structure = "Project Structure:\n"
-
-        # Get repository contents
-        contents = repository.get_contents("")
-        while contents:
-            file_content = contents.pop(0)
-            if file_content.type == "dir":
-                contents.extend(repository.get_contents(file_content.path))
-            else:
-                if should_include_file(file_content.path, include_patterns, exclude_patterns):
-                    repo_info += f"\n- {file_content.path}\n"
-                    project_structure += f"- {file_content.path}\n"
-                    # Get file content for text-based files
-                    if file_content.path.lower().endswith(('.py', '.md', '.txt', '.yml', '.yaml', '.json', '.js', '.css', '.html')):
-                        try:
-                            file_content_data = base64.b64decode(file_content.content).decode('utf-8')
-                            repo_info += "  Content:\n"
-                            repo_info += "  " + "\n  ".join(file_content_data.split("\n")) + "\n"
-                        except UnicodeDecodeError:
-                            repo_info += "  Warning: Could not decode file content. Skipping content.\n"
-
-        # Print only the project structure to the console
+        # Print the project structure to the console as files are collected
         click.echo("Collected repository structure:")
-        click.echo(project_structure)
+        click.echo("Project Structure:")
+        files = filter_files(iter_repository_files(repository), include_patterns, exclude_patterns)
+        repo_info = collect_repo_info(repository, files, ctx.obj['github_token'], max_prompt_size * 1024)
 
         # Generate README content using the full repo_info
         click.echo("Generating README content...")
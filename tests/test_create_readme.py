@@ -0,0 +1,165 @@
+import importlib
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+# windrak/__init__.py rebinds the name to the click command, so load the module itself
+cr = importlib.import_module("windrak.create_readme")
+
+
+class FakeResponse:
+    def __init__(self, chunks, error=None):
+        self.chunks = chunks
+        self.error = error
+        self.chunks_read = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        if self.error:
+            raise self.error
+
+    def iter_content(self, chunk_size):
+        for chunk in self.chunks:
+            self.chunks_read += 1
+            yield chunk
+
+
+def make_file(path, size=10):
+    return SimpleNamespace(type="file", path=path, size=size)
+
+
+def make_repository(tree=None):
+    tree = tree or {}
+    return SimpleNamespace(
+        name="repo",
+        description="A repository",
+        full_name="owner/repo",
+        get_contents=lambda path: tree[path],
+    )
+
+
+@pytest.fixture
+def responses(monkeypatch):
+    """Map file paths to fake responses and record every download."""
+    fake = SimpleNamespace(by_path={}, requested=[])
+
+    def fake_get(url, **kwargs):
+        assert kwargs.get("timeout")
+        path = url.split("/contents/", 1)[1]
+        fake.requested.append(path)
+        return fake.by_path[path]
+
+    monkeypatch.setattr(cr.requests, "get", fake_get)
+    return fake
+
+
+def test_iter_repository_files_walks_directories():
+    tree = {
+        "": [make_file("a.py"), SimpleNamespace(type="dir", path="src")],
+        "src": [make_file("src/b.py"), SimpleNamespace(type="dir", path="src/pkg")],
+        "src/pkg": [make_file("src/pkg/c.py")],
+    }
+    paths = [f.path for f in cr.iter_repository_files(make_repository(tree))]
+    assert paths == ["a.py", "src/b.py", "src/pkg/c.py"]
+
+
+def test_fetch_file_text_decodes_chunks(responses):
+    responses.by_path["a.py"] = FakeResponse([b"print(", b"1)\n"])
+    text = cr.fetch_file_text(make_repository(), make_file("a.py"), "token", 100)
+    assert text == "print(1)\n"
+
+
+def test_fetch_file_text_skips_large_file_without_download(responses):
+    assert cr.fetch_file_text(make_repository(), make_file("a.py", size=200), "token", 100) is None
+    assert responses.requested == []
+
+
+def test_fetch_file_text_stops_on_binary_first_chunk(responses):
+    response = FakeResponse([b"\x89PNG\x00\x01", b"rest", b"more"])
+    responses.by_path["a.json"] = response
+    assert cr.fetch_file_text(make_repository(), make_file("a.json"), "token", 100) is None
+    assert response.chunks_read == 1
+
+
+def test_fetch_file_text_stops_when_stream_exceeds_size(responses):
+    response = FakeResponse([b"x" * 60, b"x" * 60, b"x" * 60])
+    responses.by_path["a.py"] = response
+    assert cr.fetch_file_text(make_repository(), make_file("a.py", size=10), "token", 100) is None
+    assert response.chunks_read == 2
+
+
+def test_fetch_file_text_raises_on_non_utf8(responses):
+    responses.by_path["a.py"] = FakeResponse([b"caf\xe9"])
+    with pytest.raises(UnicodeDecodeError):
+        cr.fetch_file_text(make_repository(), make_file("a.py"), "token", 100)
+
+
+def test_collect_repo_info_warns_on_skipped_content(responses):
+    responses.by_path["bin.json"] = FakeResponse([b"\x00"])
+    responses.by_path["latin.py"] = FakeResponse([b"caf\xe9"])
+    responses.by_path["gone.py"] = FakeResponse([], error=requests.exceptions.HTTPError("404"))
+    responses.by_path["ok.py"] = FakeResponse([b"x = 1"])
+    files = [make_file(path) for path in ("bin.json", "latin.py", "gone.py", "ok.py")]
+
+    repo_info = cr.collect_repo_info(make_repository(), files, "token", 10_000)
+
+    assert "- bin.json\n  Warning: File is too large or binary" in repo_info
+    assert "- latin.py\n  Warning: Could not decode file content" in repo_info
+    assert "- gone.py\n  Warning: Could not download file content" in repo_info
+    assert "- ok.py\n  Content:\n  x = 1\n" in repo_info
+
+
+def test_collect_repo_info_lists_every_path_when_content_exceeds_budget(responses):
+    responses.by_path["small.py"] = FakeResponse([b"x = 1"])
+    files = [make_file("big.py", size=5_000), make_file("small.py", size=5)]
+    files += [make_file(f"pkg/mod{i}.py", size=5_000) for i in range(10)]
+
+    repo_info = cr.collect_repo_info(make_repository(), files, "token", 1_000)
+
+    assert len(repo_info.encode("utf-8")) <= 1_000
+    assert "- big.py\n  Warning: Prompt size limit reached" in repo_info
+    assert "- small.py\n  Content:\n  x = 1\n" in repo_info
+    for i in range(10):
+        assert f"- pkg/mod{i}.py\n" in repo_info
+    assert responses.requested == ["small.py"]
+
+
+def test_collect_repo_info_lists_every_path_once_content_budget_is_spent(responses):
+    max_bytes = cr.DEFAULT_MAX_PROMPT_SIZE * 1024
+    responses.by_path["core.py"] = FakeResponse([b"x" * 200_000])
+    files = [make_file("core.py", size=200_000)]
+    files += [make_file(f"pkg{i // 100}/mod{i}.py", size=50_000) for i in range(2_000)]
+
+    repo_info = cr.collect_repo_info(make_repository(), files, "token", max_bytes)
+
+    assert len(repo_info.encode("utf-8")) <= max_bytes
+    for file_content in files:
+        assert f"- {file_content.path}\n" in repo_info
+    # Only files skipped while some content budget remained get a per-file warning
+    assert 0 < repo_info.count("Prompt size limit reached") < 200
+    assert responses.requested == ["core.py"]
+
+
+def test_collect_repo_info_stops_walk_at_budget(responses):
+    walked = []
+
+    def files():
+        for i in range(1_000):
+            walked.append(i)
+            yield make_file(f"dir/file{i}.txt")
+
+    for i in range(1_000):
+        responses.by_path[f"dir/file{i}.txt"] = FakeResponse([b"hello"])
+
+    repo_info = cr.collect_repo_info(make_repository(), files(), "token", 2_000)
+
+    assert len(repo_info.encode("utf-8")) <= 2_000
+    assert "- dir/file0.txt\n" in repo_info
+    assert "- dir/file999.txt\n" not in repo_info
+    assert len(walked) < 1_000